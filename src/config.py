@@ -1,20 +1,56 @@
 import os
-from dotenv import load_dotenv
+from dataclasses import dataclass
+from functools import lru_cache
+from dotenv import find_dotenv, load_dotenv
 
 """
 manage configuration variables
 """
 
-load_dotenv("../.env") # .env? file path er vanskelig 
-
 
+@dataclass(frozen=True, slots=True)
 class Config:
-    def __init__(self, path=".env", gpt_model="gpt-4o-mini"):  # TODO make sure 
-        self.path = path
-        self.GPT_MODEL = os.getenv(key="GPT_MODEL", default=gpt_model)
-        self.API_KEY = os.getenv("OPENAI_API_KEY")
-        self.MONGODB_URI = os.getenv("MONGODB_URI")
-        self.MONGODB_COLLECTION = os.getenv("MONGODB_COLLECTION")
-        self.MONGODB_DATABASE = os.getenv("MONGODB_DATABASE")
-        self.RAG_DATABASE_SYSTEM = os.getenv("RAG_DATABASE_SYSTEM", "mongodb")
-        self.BASE_URL_FRONTEND = os.getenv("BASE_URL_FRONTEND", "http://localhost:8080")
+    GPT_MODEL: str = "gpt-4o-mini"
+    API_KEY: str | None = None
+    MONGODB_URI: str | None = None
+    MONGODB_COLLECTION: str | None = None
+    MONGODB_DATABASE: str | None = None
+    RAG_DATABASE_SYSTEM: str = "mongodb"
+    BASE_URL_FRONTEND: str = "http://localhost:8080"
+    EMBEDDING_DIM: int = 1536
+
+
+def _snapshot() -> dict[str, str]:
+    """
+    Copy the environment once, so each variable is a plain dict lookup
+    """
+    return os.environ.copy()
+
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """
+    Load the .env file and read the configuration variables once.
+    Set LOAD_DOTENV=0 to skip the .env lookup when the environment is
+    provided by the deployment.
+
+    Returns:
+        Config: The configuration, shared by every caller
+    """
+    if os.environ.get("LOAD_DOTENV", "1") == "1":
+        dotenv_path = find_dotenv()
+        if dotenv_path:
+            load_dotenv(dotenv_path)
+
+    env = _snapshot()
+
+    return Config(
+        GPT_MODEL=env.get("GPT_MODEL", "gpt-4o-mini"),
+        API_KEY=env.get("OPENAI_API_KEY"),
+        MONGODB_URI=env.get("MONGODB_URI"),
+        MONGODB_COLLECTION=env.get("MONGODB_COLLECTION"),
+        MONGODB_DATABASE=env.get("MONGODB_DATABASE"),
+        RAG_DATABASE_SYSTEM=env.get("RAG_DATABASE_SYSTEM", "mongodb"),
+        BASE_URL_FRONTEND=env.get("BASE_URL_FRONTEND", "http://localhost:8080"),
+        EMBEDDING_DIM=int(env.get("EMBEDDING_DIM", "1536")),
+    )
@@ -1,10 +1,10 @@
-from pydantic import BaseModel
+from dataclasses import dataclass
 from typing import Optional
 
 
 
-class Context(BaseModel):
+@dataclass(slots=True, frozen=True)
+class Context:
     text: str
     document_name: str
     NPC: Optional[int] = None
-
@@ -1,34 +1,98 @@
 
 from abc import ABC, abstractmethod
-from pymongo import MongoClient
+from bson.binary import Binary, BinaryVectorDtype
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pymongo import AsyncMongoClient, MongoClient, WriteConcern
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError
+import asyncio
 import logging
+import threading
+import time
+import numpy as np
 
 from src.context import Context
-from src.embeddings import similarity_search 
-from src.config import (
-    RAG_DATABASE_SYSTEM,
-    MONGODB_URI,
-    MONGODB_COLLECTION,
-    MONGODB_DATABASE,
-)
+from src.embeddings import normalize
+from src.config import get_config
+
+logger = logging.getLogger(__name__)
+
+# A single client of each kind is shared by the whole process, it owns the
+# connection pool and the background topology monitors.
+_CLIENT: MongoClient | None = None
+_ASYNC_CLIENT: AsyncMongoClient | None = None
+# $vectorSearch must be the first stage of a pipeline and cannot run inside
+# $facet, so batches are sent as concurrent aggregations over the shared
+# client's connection pool.
+_EXECUTOR: ThreadPoolExecutor | None = None
+_CLIENT_LOCK = threading.Lock()
+_CLIENT_OPTIONS = {
+    "maxPoolSize": 50,
+    "minPoolSize": 5,
+    "serverSelectionTimeoutMS": 5000,
+    "appname": "rag-service",
+    # Transient write failures are retried once by the driver
+    "retryWrites": True,
+}
+
+
+def _get_client() -> MongoClient:
+    """
+    Get the process-wide MongoClient, creating it on first use
 
+    Returns:
+        MongoClient: The shared client
+    """
+    global _CLIENT
 
-class Database(ABC):
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = MongoClient(get_config().MONGODB_URI, **_CLIENT_OPTIONS)
+    return _CLIENT
+
+
+def _get_async_client() -> AsyncMongoClient:
     """
-    Abstract class for Connecting to a Database
+    Get the process-wide AsyncMongoClient, creating it on first use
+
+    Returns:
+        AsyncMongoClient: The shared asyncio client
     """
+    global _ASYNC_CLIENT
 
-    @classmethod
-    def __instancecheck__(cls, instance: any) -> bool:
-        return cls.__subclasscheck__(type(instance))
+    if _ASYNC_CLIENT is None:
+        with _CLIENT_LOCK:
+            if _ASYNC_CLIENT is None:
+                _ASYNC_CLIENT = AsyncMongoClient(
+                    get_config().MONGODB_URI, **_CLIENT_OPTIONS
+                )
+    return _ASYNC_CLIENT
 
-    @classmethod
-    def __subclasscheck__(cls, subclass: any) -> bool:
-        return (
-            hasattr(subclass, "get_context") and callable(subclass.get_context)
-        ) and (
-            hasattr(subclass, "post_context") and callable(subclass.post_context)
-        )
+
+def _get_executor() -> ThreadPoolExecutor:
+    """
+    Get the process-wide thread pool for batched vector searches, creating it
+    on first use
+
+    Returns:
+        ThreadPoolExecutor: The shared thread pool
+    """
+    global _EXECUTOR
+
+    if _EXECUTOR is None:
+        with _CLIENT_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(
+                    max_workers=8, thread_name_prefix="rag-vector-search"
+                )
+    return _EXECUTOR
+
+
+class Database(ABC):
+    """
+    Abstract class for Connecting to a Database
+    """
     
     @abstractmethod
     def get_context(self, 
@@ -46,6 +110,23 @@ class Database(ABC):
             list[Context]: The context related to the question
         """
         pass
+
+    def get_context_batch(
+        self,
+        document_id: str,
+        embeddings: list[list[float]],
+    ) -> list[list[Context]]:
+        """
+        Get context for several questions about the same document
+
+        Args:
+            document_id (str)
+            embeddings (list[list[float]]): One embedding per question
+
+        Returns:
+            list[list[Context]]: The context for each embedding, in order
+        """
+        return [self.get_context(document_id, embedding) for embedding in embeddings]
     
     @abstractmethod
     def post_context(
@@ -68,6 +149,39 @@ class Database(ABC):
         """
     
         pass
+
+    def post_context_many(
+        self,
+        contexts: list[Context],
+        embeddings: list[list[float]],
+        document_id: str,
+    ) -> bool:
+        """
+        Post several contexts of the same document to the database
+
+        Args:
+            contexts (list[Context]): The contexts to be posted
+            embeddings (list[list[float]]): One embedding per context
+            document_id (str)
+
+        Returns:
+            bool: if all the contexts were posted
+        """
+        if len(contexts) != len(embeddings):
+            raise ValueError("There must be one embedding per context")
+
+        return all(
+            [
+                self.post_context(
+                    context.text,
+                    context.document_name,
+                    context.NPC,
+                    embedding,
+                    document_id,
+                )
+                for context, embedding in zip(contexts, embeddings)
+            ]
+        )
     
     @abstractmethod
     def is_reachable(self) -> bool:
@@ -83,57 +197,341 @@ class Database(ABC):
     
 
 
-class MongoDB(Database):
-    def __init__(self):
-        self.client = MongoClient(MONGODB_URI)
-        self.db = self.client[MONGODB_DATABASE]
-        self.collection = self.db[MONGODB_COLLECTION]
-        self.similarity_threshold = 0.7
+def _to_vector(embedding: list[float]) -> Binary:
+    """
+    Normalize an embedding and pack it as a BSON float32 vector, instead of
+    a BSON array of doubles
 
-    def get_context(self, document_id: str, embedding: list[float]) -> list[Context]:
-        if not embedding:
-            raise ValueError("Embedding cannot be None")
+    Args:
+        embedding (list[float])
+
+    Returns:
+        Binary: The unit length vector
+    """
+    return Binary.from_vector(normalize(embedding).tolist(), BinaryVectorDtype.FLOAT32)
+
+
+def _vector_search_pipeline(
+    document_id: str,
+    embedding: list[float],
+    limit: int,
+    similarity_threshold: float,
+) -> list[dict]:
+    """
+    Build the aggregation pipeline that finds the context for a question
+
+    Args:
+        document_id (str)
+        embedding (list[float])
+        limit (int): The maximum number of documents to return
+        similarity_threshold (float): The minimum cosine similarity
 
-        # Define the MongoDB query that utilizes the search index "embeddings".
-        query = {
+    Returns:
+        list[dict]: The pipeline
+    """
+    # Define the MongoDB query that utilizes the search index "embeddings".
+    # documentId is a filter field in the index, so only chunks from the
+    # requested document are considered as candidates.
+    return [
+        {
             "$vectorSearch": {
                 "index": "embeddings",
                 "path": "embedding",
-                "queryVector": embedding,
-                "numCandidates": 30, # numCandidates = 10 * limit
-                "limit": 3,
+                "queryVector": _to_vector(embedding),
+                "filter": {"documentId": document_id},
+                "numCandidates": 10 * limit,
+                "limit": limit,
+            }
+        },
+        {
+            "$addFields": {
+                "score": {"$meta": "vectorSearchScore"},
+            }
+        },
+        # Atlas reports the dot product of unit vectors, i.e. the cosine
+        # similarity, as (1 + cosine) / 2
+        {
+            "$match": {
+                "score": {"$gt": (1 + similarity_threshold) / 2},
             }
-        }
+        },
+        {
+            "$project": {
+                "text": 1,
+                "documentName": 1,
+                "NPC": 1,
+                "_id": 0,
+            }
+        },
+    ]
 
-        # Execute the query
-        documents = self.collection.aggregate([query])
 
-        if not documents:
-            raise ValueError("No documents found")
-
-        # Convert to list
-        documents = list(documents)
-
-        results = []
-
-        # Filter out the documents with low similarity
-        for document in documents:
-            if document["documentId"] != document_id:
-                continue
-
-            if (
-                similarity_search(embedding, document["embedding"])
-                > self.similarity_threshold
-            ):
-                results.append(
-                    Context(
-                        text=document["text"],
-                        document_name=document["documentName"],
-                        NPC=document["NPC"],
-                    )
-                )
+def _aggregate_options(limit: int) -> dict:
+    """
+    Get the options for running the vector search pipeline
+
+    Args:
+        limit (int): The maximum number of documents the pipeline returns
+
+    Returns:
+        dict: The keyword arguments for aggregate()
+    """
+    # The batch holds one more document than the limit, so the whole result
+    # arrives in the first reply and no getMore is needed.
+    return {
+        "batchSize": limit + 1,
+        "allowDiskUse": False,
+        "maxTimeMS": 2000,
+    }
 
-        return results
+
+def _check_embedding(embedding: list[float], embedding_dim: int) -> None:
+    """
+    Validate an embedding once at the DAO boundary, so the search path can
+    rely on its shape
+
+    Args:
+        embedding (list[float])
+        embedding_dim (int): The dimension of the embedding model
+    """
+    if not embedding:
+        raise ValueError("Embedding cannot be None")
+
+    if len(embedding) != embedding_dim:
+        raise ValueError(f"Embedding must have {embedding_dim} dimensions")
+
+
+def _to_context(document: dict) -> Context:
+    return Context(
+        text=document["text"],
+        document_name=document["documentName"],
+        NPC=document["NPC"],
+    )
+
+
+def _context_document(
+    text: str,
+    document_name: str,
+    NPC: int,
+    embedding: list[float],
+    document_id: str,
+    embedding_dim: int,
+) -> dict:
+    """
+    Validate a context and build the document stored for it
+
+    Args:
+        embedding_dim (int): The dimension of the embedding model
+
+    Returns:
+        dict: The document to insert
+    """
+    if not text:
+        raise ValueError("text cannot be None")
+    
+    if NPC is None:
+        raise ValueError("NPC cannot be None")
+    
+    if not document_name:
+        raise ValueError("Document name cannot be None")
+    
+    _check_embedding(embedding, embedding_dim)
+
+    return {
+        "text": text,
+        "documentName": document_name,
+        "NPC": NPC,
+        "embedding": _to_vector(embedding),
+        "documentId": document_id,
+    }
+
+
+def _only_duplicate_keys(error: BulkWriteError) -> bool:
+    """
+    Check if a bulk write failed only because some documents already existed
+
+    Args:
+        error (BulkWriteError)
+
+    Returns:
+        bool: if every write error is a duplicate key error
+    """
+    return not error.details.get("writeConcernErrors") and all(
+        write_error["code"] == 11000
+        for write_error in error.details.get("writeErrors", [])
+    )
+
+
+class _MongoDBBase(Database):
+    """
+    State and driver-independent logic shared by MongoDB and AsyncMongoDB.
+    The subclasses only add the calls to their client.
+    """
+
+    def __init__(self, client: MongoClient | AsyncMongoClient):
+        config = get_config()
+        self.client = client
+        self.db = self.client[config.MONGODB_DATABASE]
+        self.collection = self.db[config.MONGODB_COLLECTION]
+        # Bulk ingestion is acknowledged without waiting for the journal
+        self.bulk_collection = self.collection.with_options(
+            write_concern=WriteConcern(w=1, j=False)
+        )
+        self.similarity_threshold = 0.7
+        self.search_limit = 3
+        self.embedding_dim = config.EMBEDDING_DIM
+        # (monotonic time of the last ping, its result), -inf when never pinged
+        self._ping_cache: tuple[float, bool] = (float("-inf"), False)
+        self.ping_ttl = 5.0
+        # documentIds seen in the collection and when they were last loaded,
+        # None until the first load. Unknown ids get no context without a
+        # search while the set is fresh; once known_document_ids_refresh
+        # seconds have passed, an unknown id reloads it. A document inserted
+        # through another worker is therefore found at most 30 s late.
+        self._known_document_ids: set[str] = set()
+        self._known_document_ids_at: float | None = None
+        self.known_document_ids_refresh = 30.0
+
+    def _search_pipeline(self, document_id: str, embedding: list[float]) -> list[dict]:
+        _check_embedding(embedding, self.embedding_dim)
+
+        return _vector_search_pipeline(
+            document_id, embedding, self.search_limit, self.similarity_threshold
+        )
+
+    def _context_documents(
+        self,
+        contexts: list[Context],
+        embeddings: list[list[float]],
+        document_id: str,
+    ) -> list[dict]:
+        if len(contexts) != len(embeddings):
+            raise ValueError("There must be one embedding per context")
+
+        return [
+            _context_document(
+                context.text,
+                context.document_name,
+                context.NPC,
+                embedding,
+                document_id,
+                self.embedding_dim,
+            )
+            for context, embedding in zip(contexts, embeddings)
+        ]
+
+    def _is_duplicate_only(self, error: PyMongoError, document_id: str) -> bool:
+        """
+        Check if an insert failed only because the contexts already existed.
+        The document then has contexts stored, so its id is known.
+
+        Args:
+            error (PyMongoError): The error raised by the driver
+            document_id (str)
+
+        Returns:
+            bool: if only duplicate keys failed
+        """
+        # With an unordered insert the other documents are still written
+        if isinstance(error, DuplicateKeyError) or (
+            isinstance(error, BulkWriteError) and _only_duplicate_keys(error)
+        ):
+            self._known_document_ids.add(document_id)
+            return True
+
+        return False
+
+    def _cached_ping(self) -> bool | None:
+        """
+        Get the result of the last ping if it is recent enough
+
+        Returns:
+            bool | None: reachable, or None if the server must be pinged
+        """
+        pinged_at, reachable = self._ping_cache
+        if time.monotonic() - pinged_at < self.ping_ttl:
+            return reachable
+        return None
+
+    def _ping_done(self, reachable: bool, error: Exception | None = None) -> bool:
+        if reachable:
+            logger.info("Successfully pinged MongoDB")
+        else:
+            logger.error(f"Failed to ping MongoDB: {error}")
+
+        self._ping_cache = (time.monotonic(), reachable)
+        return reachable
+
+    def _invalidate_ping_cache(self) -> None:
+        """
+        Forget the last ping so the next is_reachable() asks the server again
+        """
+        self._ping_cache = (float("-inf"), False)
+
+    def _known_document(self, document_id: str) -> bool | None:
+        """
+        Check if any context has been stored for the document, without running
+        the vector search for ids that do not exist
+
+        Args:
+            document_id (str)
+
+        Returns:
+            bool | None: if the document is known, or None if the known
+                         documentIds must be reloaded first
+        """
+        if document_id in self._known_document_ids:
+            return True
+
+        if (
+            self._known_document_ids_at is not None
+            and time.monotonic() - self._known_document_ids_at
+            < self.known_document_ids_refresh
+        ):
+            return False
+
+        return None
+
+    def _reload_known_documents(self, document_ids: list[str], document_id: str) -> bool:
+        self._known_document_ids = set(document_ids)
+        self._known_document_ids_at = time.monotonic()
+        return document_id in self._known_document_ids
+
+
+class MongoDB(_MongoDBBase):
+    def __init__(self):
+        super().__init__(_get_client())
+        self.executor = _get_executor()
+        # Concurrent misses wait for one distinct() instead of each running one
+        self._reload_lock = threading.Lock()
+
+    def get_context(self, document_id: str, embedding: list[float]) -> list[Context]:
+        pipeline = self._search_pipeline(document_id, embedding)
+
+        # Execute the query, low similarity documents are already filtered out
+        try:
+            if not self._is_known_document(document_id):
+                return []
+
+            documents = self.collection.aggregate(
+                pipeline, **_aggregate_options(self.search_limit)
+            )
+            return [_to_context(document) for document in documents]
+        except PyMongoError:
+            self._invalidate_ping_cache()
+            raise
+
+    def get_context_batch(
+        self,
+        document_id: str,
+        embeddings: list[list[float]],
+    ) -> list[list[Context]]:
+        return list(
+            self.executor.map(
+                lambda embedding: self.get_context(document_id, embedding),
+                embeddings,
+            )
+        )
 
     def post_context(
         self,
@@ -143,42 +541,187 @@ class MongoDB(Database):
         embedding: list[float],
         document_id: str,
     ) -> bool:
-        if not text:
-            raise ValueError("text cannot be None")
-        
-        if NPC is None:
-            raise ValueError("NPC cannot be None")
-        
-        if not document_name:
-            raise ValueError("Document name cannot be None")
-        
-        if not embedding:
-            raise ValueError("Embedding cannot be None")
+        document = _context_document(
+            text, document_name, NPC, embedding, document_id, self.embedding_dim
+        )
 
         try:
             # Insert the curriculum into the database with metadata
-            self.collection.insert_one(
-                {
-                    "text": text,
-                    "documentName": document_name,
-                    "NPC": NPC,
-                    "embedding": embedding,
-                    "documentId": document_id,
-                }
+            self.collection.insert_one(document)
+            self._known_document_ids.add(document_id)
+            return True
+        except PyMongoError as e:
+            if self._is_duplicate_only(e, document_id):
+                return False
+            logger.warning(f"Failed to insert context into MongoDB: {e}")
+            self._invalidate_ping_cache()
+            raise
+
+    def post_context_many(
+        self,
+        contexts: list[Context],
+        embeddings: list[list[float]],
+        document_id: str,
+    ) -> bool:
+        documents = self._context_documents(contexts, embeddings, document_id)
+        # insert_many rejects an empty list
+        if not documents:
+            return True
+
+        try:
+            # Insert all the contexts in one unordered, unjournaled bulk write
+            self.bulk_collection.insert_many(
+                documents, ordered=False, bypass_document_validation=True
             )
+            self._known_document_ids.add(document_id)
             return True
-        except:
-            return False
+        except PyMongoError as e:
+            if self._is_duplicate_only(e, document_id):
+                return False
+            logger.warning(f"Failed to insert context into MongoDB: {e}")
+            self._invalidate_ping_cache()
+            raise
 
     def is_reachable(self) -> bool:
+        reachable = self._cached_ping()
+        if reachable is not None:
+            return reachable
+
         try:
             # Send a ping to confirm a successful connection
             self.client.admin.command("ping")
-            logger.info("Successfully pinged MongoDB")
+            return self._ping_done(True)
+        except Exception as e:
+            return self._ping_done(False, e)
+
+    def _is_known_document(self, document_id: str) -> bool:
+        known = self._known_document(document_id)
+        if known is not None:
+            return known
+
+        with self._reload_lock:
+            # Another thread may have reloaded while this one waited
+            known = self._known_document(document_id)
+            if known is None:
+                known = self._reload_known_documents(
+                    self.collection.distinct("documentId"), document_id
+                )
+        return known
+
+
+class AsyncMongoDB(_MongoDBBase):
+    """
+    MongoDB on the asyncio driver, for serving many requests on one event loop.
+    The methods are coroutines with the same arguments as MongoDB.
+    """
+
+    def __init__(self):
+        super().__init__(_get_async_client())
+        # Concurrent misses wait for one distinct() instead of each running one
+        self._reload_lock = asyncio.Lock()
+
+    async def get_context(self, document_id: str, embedding: list[float]) -> list[Context]:
+        pipeline = self._search_pipeline(document_id, embedding)
+
+        # Execute the query, low similarity documents are already filtered out
+        try:
+            if not await self._is_known_document(document_id):
+                return []
+
+            cursor = await self.collection.aggregate(
+                pipeline, **_aggregate_options(self.search_limit)
+            )
+            documents = await cursor.to_list(self.search_limit)
+            return [_to_context(document) for document in documents]
+        except PyMongoError:
+            self._invalidate_ping_cache()
+            raise
+
+    async def get_context_batch(
+        self,
+        document_id: str,
+        embeddings: list[list[float]],
+    ) -> list[list[Context]]:
+        return list(
+            await asyncio.gather(
+                *(self.get_context(document_id, embedding) for embedding in embeddings)
+            )
+        )
+
+    async def post_context(
+        self,
+        text: str,
+        document_name: str,
+        NPC: int,
+        embedding: list[float],
+        document_id: str,
+    ) -> bool:
+        document = _context_document(
+            text, document_name, NPC, embedding, document_id, self.embedding_dim
+        )
+
+        try:
+            # Insert the curriculum into the database with metadata
+            await self.collection.insert_one(document)
+            self._known_document_ids.add(document_id)
+            return True
+        except PyMongoError as e:
+            if self._is_duplicate_only(e, document_id):
+                return False
+            logger.warning(f"Failed to insert context into MongoDB: {e}")
+            self._invalidate_ping_cache()
+            raise
+
+    async def post_context_many(
+        self,
+        contexts: list[Context],
+        embeddings: list[list[float]],
+        document_id: str,
+    ) -> bool:
+        documents = self._context_documents(contexts, embeddings, document_id)
+        # insert_many rejects an empty list
+        if not documents:
             return True
+
+        try:
+            # Insert all the contexts in one unordered, unjournaled bulk write
+            await self.bulk_collection.insert_many(
+                documents, ordered=False, bypass_document_validation=True
+            )
+            self._known_document_ids.add(document_id)
+            return True
+        except PyMongoError as e:
+            if self._is_duplicate_only(e, document_id):
+                return False
+            logger.warning(f"Failed to insert context into MongoDB: {e}")
+            self._invalidate_ping_cache()
+            raise
+
+    async def is_reachable(self) -> bool:
+        reachable = self._cached_ping()
+        if reachable is not None:
+            return reachable
+
+        try:
+            # Send a ping to confirm a successful connection
+            await self.client.admin.command("ping")
+            return self._ping_done(True)
         except Exception as e:
-            logger.error(f"Failed to ping MongoDB: {e}")
-            return False
+            return self._ping_done(False, e)
+
+    async def _is_known_document(self, document_id: str) -> bool:
+        known = self._known_document(document_id)
+        if known is not None:
+            return known
+
+        async with self._reload_lock:
+            # Another task may have reloaded while this one waited
+            known = self._known_document(document_id)
+            if known is None:
+                known = self._reload_known_documents(
+                    await self.collection.distinct("documentId"), document_id
+                )
+        return known
 
 
 
@@ -200,29 +743,65 @@ class MockDatabase(Database):
     def __init__(self):
         # Initialize only once (avoiding resetting on subsequent calls)
         if not hasattr(self, "initialized"):
-            self.data = []  # In-memory storage for mock data
+            # In-memory storage for mock data, one float16 matrix of normalized
+            # embeddings per document with the metadata rows in the same order.
+            # Matrices are allocated ahead and only the first len(meta) rows
+            # are in use.
+            self.matrices: dict[str, np.ndarray] = {}
+            self.meta: dict[str, list[dict]] = {}
             self.similarity_threshold = 0.7
+            self.embedding_dim = get_config().EMBEDDING_DIM
             self.initialized = True
 
+    def get_context(self, document_name: str, embedding: list[float]) -> list[Context]:
+        return self.get_curriculum(document_name, embedding)
+
+    def post_context(
+        self,
+        text: str,
+        document_name: str,
+        NPC: int,
+        embedding: list[float],
+        document_id: str,
+    ) -> bool:
+        if not text:
+            raise ValueError("text cannot be None")
+
+        if NPC is None:
+            raise ValueError("NPC cannot be None")
+
+        if not document_name:
+            raise ValueError("Document name cannot be None")
+
+        _check_embedding(embedding, self.embedding_dim)
+
+        # Contexts have no page numbers, so only the curriculum storage is shared
+        self._append_rows(
+            document_name,
+            normalize(embedding)[np.newaxis, :],
+            [{"text": text, "NPC": NPC, "document_id": document_id}],
+        )
+        return True
+
     def get_curriculum(self, document_name: str, embedding: list[float]) -> list[Context]:
-        if not embedding:
-            raise ValueError("Embedding cannot be None")
-
-        results = []
-
-        # Filter documents based on similarity and document_name
-        for document in self.data:
-            if document["document_name"] == document_name:
-                similarity = similarity_search(embedding, document["embedding"])
-                if similarity > self.similarity_threshold:
-                    results.append(
-                        Context(
-                            text=document["text"],
-                            document_name=document["document_name"],
-                            NPC=document["NPC"],
-                        )
-                    )
-        return results 
+        _check_embedding(embedding, self.embedding_dim)
+
+        matrix = self.matrices.get(document_name)
+        if matrix is None:
+            return []
+
+        # Cosine similarity against every stored embedding of the document
+        rows = self.meta[document_name]
+        scores = matrix[: len(rows)].astype(np.float32) @ normalize(embedding)
+
+        return [
+            Context(
+                text=rows[i]["text"],
+                document_name=document_name,
+                NPC=rows[i].get("NPC"),
+            )
+            for i in np.flatnonzero(scores > self.similarity_threshold)
+        ]
 
     def post_curriculum(
         self,
@@ -235,24 +814,104 @@ class MockDatabase(Database):
     ) -> bool:
         if not curriculum or not document_name or page_num is None or not embedding:
             raise ValueError("All parameters are required and must be valid")
+        _check_embedding(embedding, self.embedding_dim)
 
-        # Append a new document to the in-memory storage
-        self.data.append(
-            {
-                "text": curriculum,
-                "page_num": page_num,
-                "predicted_page_number": predicted_page_number,
-                "document_name": document_name,
-                "embedding": embedding,
-                "document_id": document_id,
-            }
+        # Append a new row to the in-memory storage
+        self._append_rows(
+            document_name,
+            normalize(embedding)[np.newaxis, :],
+            [
+                {
+                    "text": curriculum,
+                    "page_num": page_num,
+                    "predicted_page_number": predicted_page_number,
+                    "document_id": document_id,
+                }
+            ],
+        )
+        return True
+
+    def post_curriculum_many(
+        self,
+        curricula: list[str],
+        page_nums: list[int],
+        predicted_page_numbers: list[int],
+        document_name: str,
+        embeddings: list[list[float]],
+        document_id: str,
+    ) -> bool:
+        if not (len(curricula) == len(page_nums) == len(predicted_page_numbers) == len(embeddings)):
+            raise ValueError("All lists must have the same length")
+
+        if (
+            not document_name
+            or not all(curricula)
+            or any(page_num is None for page_num in page_nums)
+            or not all(embeddings)
+        ):
+            raise ValueError("All parameters are required and must be valid")
+        for embedding in embeddings:
+            _check_embedding(embedding, self.embedding_dim)
+
+        if not curricula:
+            return True
+
+        # Append all the new rows to the in-memory storage at once
+        self._append_rows(
+            document_name,
+            np.stack([normalize(embedding) for embedding in embeddings]),
+            [
+                {
+                    "text": curriculum,
+                    "page_num": page_num,
+                    "predicted_page_number": predicted_page_number,
+                    "document_id": document_id,
+                }
+                for curriculum, page_num, predicted_page_number in zip(
+                    curricula, page_nums, predicted_page_numbers
+                )
+            ],
         )
         return True
 
     def is_reachable(self) -> bool:
         return True
 
+    def _append_rows(
+        self,
+        document_name: str,
+        vectors: np.ndarray,
+        rows: list[dict],
+    ) -> None:
+        """
+        Append normalized embeddings and their metadata rows to a document.
+        The matrix doubles its capacity when full, so appending is amortized O(1).
+
+        Args:
+            document_name (str)
+            vectors (np.ndarray): One normalized embedding per row
+            rows (list[dict]): The metadata rows
+        """
+        matrix = self.matrices.get(document_name)
+        meta = self.meta.setdefault(document_name, [])
+        count = len(meta)
+        needed = count + len(rows)
+
+        if matrix is None or needed > matrix.shape[0]:
+            capacity = 1024 if matrix is None else matrix.shape[0]
+            while capacity < needed:
+                capacity *= 2
+
+            grown = np.empty((capacity, self.embedding_dim), dtype=np.float16)
+            if matrix is not None:
+                grown[:count] = matrix[:count]
+            self.matrices[document_name] = matrix = grown
+
+        matrix[count:needed] = vectors
+        meta.extend(rows)
+
 
+@lru_cache(maxsize=1)
 def get_database() -> Database:
     """
     Get the database to use
@@ -260,7 +919,7 @@ def get_database() -> Database:
     Returns:
         Database: The database to use
     """
-    match RAG_DATABASE_SYSTEM.lower():
+    match get_config().RAG_DATABASE_SYSTEM.lower():
         case "mock":
             return MockDatabase()  # This will always return the singleton instance
         case "mongodb":
@@ -1,13 +1,27 @@
+import numpy as np
+
+
+def normalize(embedding: list[float]) -> np.ndarray:
+    """L2-normalize an embedding
+
+    Args:
+        embedding (list[float]): The embedding
+
+    Returns:
+        np.ndarray: The embedding as a unit length float32 vector
+    """
+    vector = np.asarray(embedding, dtype=np.float32)
+    return vector / (np.linalg.norm(vector) + 1e-9)
+
 
-# placeholder. TODO: similarity search
 def similarity_search(embedding1: list[float], embedding2: list[float]) -> float:
-    """Smiliarity search 
+    """Cosine similarity between two embeddings
 
     Args:
-        embedding1 (list[float]): _description_
-        embedding2 (list[float]): _description_
+        embedding1 (list[float]): The first embedding
+        embedding2 (list[float]): The second embedding
 
     Returns:
-        float: _description_
+        float: The cosine similarity, between -1 and 1
     """
-    pass
\ No newline at end of file
+    return float(np.dot(normalize(embedding1), normalize(embedding2)))
\ No newline at end of file
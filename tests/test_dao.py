@@ -0,0 +1,256 @@
+import asyncio
+import time
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from src import dao
+from src.context import Context
+from src.dao import AsyncMongoDB, MockDatabase, MongoDB
+
+
+@pytest.fixture
+def db():
+    # MockDatabase is a singleton, start every test from an empty instance
+    MockDatabase._instance = None
+    yield MockDatabase()
+    MockDatabase._instance = None
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Starts shortly after boot, where time.monotonic() is small
+    now = [100.0]
+    monkeypatch.setattr(dao.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    monkeypatch.setattr(dao, "_get_client", mock.MagicMock)
+    db = MongoDB()
+    db.collection.distinct.return_value = ["known"]
+    db.collection.aggregate.side_effect = lambda *args, **kwargs: iter(
+        [{"text": "text", "documentName": "doc", "NPC": 1}]
+    )
+    return db
+
+
+def unit(db, i: int) -> list[float]:
+    embedding = [0.0] * db.embedding_dim
+    embedding[i] = 1.0
+    return embedding
+
+
+def test_get_context_returns_posted_context(db):
+    assert db.post_context("text", "doc", 1, unit(db, 0), "id")
+
+    assert db.get_context("doc", unit(db, 0)) == [
+        Context(text="text", document_name="doc", NPC=1)
+    ]
+
+
+def test_get_curriculum_filters_on_similarity_threshold(db):
+    # cosine 0.8 is above the 0.7 threshold, cosine 0.6 is below
+    close = [0.0] * db.embedding_dim
+    close[0], close[1] = 0.8, 0.6
+    far = [0.0] * db.embedding_dim
+    far[0], far[1] = 0.6, 0.8
+
+    db.post_curriculum("close", 1, 1, "doc", close, "id")
+    db.post_curriculum("far", 2, 2, "doc", far, "id")
+    db.post_curriculum("orthogonal", 3, 3, "doc", unit(db, 2), "id")
+
+    results = db.get_curriculum("doc", unit(db, 0))
+
+    assert [context.text for context in results] == ["close"]
+
+
+def test_get_curriculum_unknown_document_is_empty(db):
+    db.post_curriculum("text", 1, 1, "doc", unit(db, 0), "id")
+
+    assert db.get_curriculum("other", unit(db, 0)) == []
+
+
+def test_post_curriculum_many_empty_is_noop(db):
+    assert db.post_curriculum_many([], [], [], "doc", [], "id")
+
+    assert "doc" not in db.matrices
+    assert db.get_curriculum("doc", unit(db, 0)) == []
+
+
+def test_matrix_grows_past_initial_capacity(db):
+    count = 1500
+    db.post_curriculum("first", 0, 0, "doc", unit(db, 0), "id")
+    db.post_curriculum_many(
+        [f"page {i}" for i in range(1, count)],
+        list(range(1, count)),
+        list(range(1, count)),
+        "doc",
+        [unit(db, 1)] * (count - 1),
+        "id",
+    )
+
+    assert db.matrices["doc"].shape == (2048, db.embedding_dim)
+    assert db.matrices["doc"].dtype == np.float16
+    assert len(db.meta["doc"]) == count
+    # Rows written before the growth are kept
+    assert [context.text for context in db.get_curriculum("doc", unit(db, 0))] == ["first"]
+    assert len(db.get_curriculum("doc", unit(db, 1))) == count - 1
+
+
+def test_embedding_dimension_is_checked(db):
+    with pytest.raises(ValueError):
+        db.post_curriculum("text", 1, 1, "doc", [1.0, 0.0], "id")
+
+    with pytest.raises(ValueError):
+        db.get_curriculum("doc", [1.0, 0.0])
+
+
+def test_first_load_reads_document_ids(mongo, clock):
+    assert mongo.get_context("known", unit(mongo, 0)) == [
+        Context(text="text", document_name="doc", NPC=1)
+    ]
+    assert mongo.collection.distinct.call_count == 1
+
+
+def test_known_document_does_not_reload(mongo, clock):
+    mongo.get_context("known", unit(mongo, 0))
+    clock[0] += 1000
+    mongo.get_context("known", unit(mongo, 0))
+
+    assert mongo.collection.distinct.call_count == 1
+    assert mongo.collection.aggregate.call_count == 2
+
+
+def test_unknown_document_inside_window_skips_search(mongo, clock):
+    mongo.get_context("known", unit(mongo, 0))
+    clock[0] += mongo.known_document_ids_refresh - 1
+
+    for _ in range(10):
+        assert mongo.get_context("unknown", unit(mongo, 0)) == []
+
+    assert mongo.collection.distinct.call_count == 1
+    assert mongo.collection.aggregate.call_count == 1
+
+
+def test_unknown_document_after_window_reloads(mongo, clock):
+    mongo.get_context("known", unit(mongo, 0))
+    mongo.collection.distinct.return_value = ["known", "inserted elsewhere"]
+    clock[0] += mongo.known_document_ids_refresh
+
+    assert mongo.get_context("inserted elsewhere", unit(mongo, 0))
+    assert mongo.collection.distinct.call_count == 2
+
+
+def test_concurrent_misses_reload_once(mongo):
+    def slow_distinct(field):
+        time.sleep(0.05)
+        return ["known"]
+
+    mongo.collection.distinct.side_effect = slow_distinct
+
+    assert mongo.get_context_batch("unknown", [unit(mongo, 0)] * 8) == [[]] * 8
+    assert mongo.collection.distinct.call_count == 1
+    assert mongo.collection.aggregate.call_count == 0
+
+
+def test_async_concurrent_misses_reload_once(monkeypatch):
+    monkeypatch.setattr(dao, "_get_async_client", mock.MagicMock)
+    db = AsyncMongoDB()
+
+    async def slow_distinct(field):
+        await asyncio.sleep(0.05)
+        return ["known"]
+
+    db.collection.distinct = mock.AsyncMock(side_effect=slow_distinct)
+    db.collection.aggregate = mock.AsyncMock()
+
+    results = asyncio.run(db.get_context_batch("unknown", [unit(db, 0)] * 8))
+
+    assert results == [[]] * 8
+    assert db.collection.distinct.await_count == 1
+    assert db.collection.aggregate.await_count == 0
+
+
+def test_duplicate_context_returns_false(mongo):
+    mongo.collection.insert_one.side_effect = dao.DuplicateKeyError("duplicate")
+
+    assert mongo.post_context("text", "doc", 1, unit(mongo, 0), "id") is False
+    assert "id" in mongo._known_document_ids
+
+
+def test_bulk_insert_of_only_duplicates_returns_false(mongo):
+    mongo.bulk_collection.insert_many.side_effect = dao.BulkWriteError(
+        {"writeErrors": [{"code": 11000}, {"code": 11000}]}
+    )
+    contexts = [Context(text="a", document_name="doc", NPC=1)] * 2
+
+    assert mongo.post_context_many(contexts, [unit(mongo, 0)] * 2, "id") is False
+    assert "id" in mongo._known_document_ids
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        dao.PyMongoError("connection lost"),
+        dao.BulkWriteError({"writeErrors": [{"code": 11000}, {"code": 121}]}),
+    ],
+)
+def test_other_insert_errors_are_raised(mongo, clock, error):
+    mongo.is_reachable()
+    mongo.bulk_collection.insert_many.side_effect = error
+    contexts = [Context(text="a", document_name="doc", NPC=1)] * 2
+
+    with pytest.raises(type(error)):
+        mongo.post_context_many(contexts, [unit(mongo, 0)] * 2, "id")
+
+    # The cached ping is dropped, so the next check asks the server again
+    mongo.is_reachable()
+    assert mongo.client.admin.command.call_count == 2
+
+
+def test_ping_is_cached_for_ping_ttl(mongo, clock):
+    assert mongo.is_reachable()
+    clock[0] += mongo.ping_ttl - 1
+    assert mongo.is_reachable()
+    assert mongo.client.admin.command.call_count == 1
+
+    clock[0] += 1
+    assert mongo.is_reachable()
+    assert mongo.client.admin.command.call_count == 2
+
+
+def test_failed_search_forces_a_new_ping(mongo, clock):
+    mongo.is_reachable()
+    mongo.collection.aggregate.side_effect = dao.PyMongoError("connection lost")
+
+    with pytest.raises(dao.PyMongoError):
+        mongo.get_context("known", unit(mongo, 0))
+
+    mongo.client.admin.command.side_effect = dao.PyMongoError("connection lost")
+    assert mongo.is_reachable() is False
+    assert mongo.client.admin.command.call_count == 2
+
+
+def test_vector_search_pipeline():
+    search, add_score, match, project = dao._vector_search_pipeline(
+        "id", [3.0, 4.0], limit=3, similarity_threshold=0.7
+    )
+
+    assert search["$vectorSearch"]["filter"] == {"documentId": "id"}
+    assert search["$vectorSearch"]["numCandidates"] == 30
+    assert search["$vectorSearch"]["limit"] == 3
+    # The query vector is sent normalized
+    assert search["$vectorSearch"]["queryVector"].as_vector().data == pytest.approx([0.6, 0.8])
+    assert add_score == {"$addFields": {"score": {"$meta": "vectorSearchScore"}}}
+    # Atlas scores are (1 + cosine) / 2, so cosine 0.7 is a score of 0.85
+    assert match["$match"]["score"]["$gt"] == pytest.approx(0.85)
+    assert "embedding" not in project["$project"]
+
+
+def test_mongodb_instances_share_one_thread_pool(monkeypatch):
+    monkeypatch.setattr(dao, "_get_client", mock.MagicMock)
+
+    assert MongoDB().executor is MongoDB().executor